@@ -1,12 +1,19 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 
 import sys
-try:
-    sample_sheet = sys.argv[1]
-    ref_gtf = sys.argv[2]
-    lnc_gtf = sys.argv[3]
-except IndexError:
-    print '''Usage:
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import subprocess
+import shutil
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Parallel, delayed
+
+USAGE = '''Usage:
     %s SAMPLE_SHEET REFERENCE_GTF LNCRNA_GTF
 
     SAMPLE_SHEET is a two-column tab delimited table with no header, which maps
@@ -21,15 +28,103 @@ except IndexError:
 
     REFERENCE_GTF contains all annotated transcripts.
     LNCRNA_GTF contains all known lncRNA transcripts.
-    ''' % sys.argv[0].split('/')[-1]
-    sys.exit(1)
+    '''
 
-import pandas as pd
-import subprocess
-import shutil
-import os
-import csv
-from glob import glob
+# Cufflinks writes gene_id before cov.
+_CUFF_ATTR_PATTERN = r'gene_id "(?P<gene_id>[^"]+)";.*?cov "(?P<cov>[^"]+)"'
+
+# Reference GTFs make no promise about attribute order, so look keys up one at a time.
+_ATTR_PATTERNS = {key: rf'{key} "(?P<{key}>[^"]+)"'
+                  for key in ('gene_id', 'transcript_id', 'gene_name')}
+
+_TMAP_COLUMNS = ['cuff_id', 'class_code', 'ref_id', 'ref_gene_id']
+_TMAP_TYPES = {name: pa.string() for name in _TMAP_COLUMNS}
+
+# Bump when a _parse_*_gtf function changes so stale Parquet caches are ignored.
+_PARSE_CACHE_VERSION = 1
+
+_GTF_COLUMNS = [f'f{i}' for i in range(9)]
+_GTF_TYPES = {name: pa.int64() if i in (3, 4) else pa.string()
+              for i, name in enumerate(_GTF_COLUMNS)}
+
+def _skip_row(row):
+    # Comment lines do not have nine fields; drop them. Any other
+    # malformed record is an error, as it was with pd.read_table.
+    return 'skip' if row.text.startswith('#') else 'error'
+
+def _gtf_field_count(path):
+    # Some tools end every GTF line with a tab, giving an empty tenth
+    # field; take the width from the first record, as pd.read_table does.
+    with open(path, 'rb') as fid:
+        for line in fid:
+            if line.strip() and not line.startswith(b'#'):
+                return max(9, line.rstrip(b'\r\n').count(b'\t') + 1)
+    return 9
+
+def _read_gtf_cols(path, cols):
+    '''
+    Load the selected GTF columns with the multi-threaded pyarrow CSV reader,
+    parsing straight from a memory map of the file.
+
+    Every record must have as many fields as the first one (nine, or ten
+    when lines end with a tab); '#' comment lines are skipped and any other
+    malformed line raises.
+
+    Returns a DataFrame whose columns are labelled by their GTF column
+    number, as pd.read_table(..., header=None) would.
+    '''
+    column_names = [f'f{i}' for i in range(_gtf_field_count(path))]
+    with pa.memory_map(path, 'r') as source:
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(use_threads=True,
+                                           block_size=16 * 1024 * 1024,
+                                           column_names=column_names),
+            parse_options=pacsv.ParseOptions(delimiter='\t',
+                                             quote_char=False,
+                                             invalid_row_handler=_skip_row),
+            convert_options=pacsv.ConvertOptions(include_columns=[_GTF_COLUMNS[i] for i in cols],
+                                                 column_types=_GTF_TYPES))
+    df = table.to_pandas()
+    df.columns = list(cols)
+    return df
+
+def _extract_attrs(series, *patterns):
+    '''
+    Match regexes with named groups against every GTF attribute string.
+
+    The column is converted to Arrow once and each pattern is scanned by
+    Arrow's compiled regex kernel rather than row by row in Python.
+    Returns a DataFrame with one column per named group; rows that do not
+    match are null.
+    '''
+    strings = pa.array(series, type=pa.string())
+    columns = {}
+    for pattern in patterns:
+        matches = pc.extract_regex(strings, pattern=pattern)
+        for field, values in zip(matches.type, matches.flatten()):
+            columns[field.name] = values.to_numpy(zero_copy_only=False)
+    return pd.DataFrame(columns, index=series.index)
+
+def _attrs(series, *keys):
+    return _extract_attrs(series, *[_ATTR_PATTERNS[key] for key in keys])
+
+def _write_gtf(df, path):
+    '''
+    Write GTF columns 0-8 of df to path.
+
+    Arrow's CSV writer will not emit the unquoted '"' characters every GTF
+    attribute column contains, so rows are assembled with Arrow's string
+    kernels instead and written out as a single buffer.
+    '''
+    table = pa.Table.from_pandas(df.loc[:, range(9)], preserve_index=False)
+    columns = [pc.cast(column, pa.large_string()) for column in table.columns]
+    tab, newline, empty = [pa.scalar(c, pa.large_string()) for c in ('\t', '\n', '')]
+    lines = pc.binary_join_element_wise(*columns, tab, null_handling='replace')
+    lines = pc.binary_join_element_wise(lines, empty, newline).combine_chunks()
+    body = pc.binary_join(pa.LargeListArray.from_arrays([0, len(lines)], lines), empty)[0]
+    with open(path, 'wb') as outfid:
+        outfid.write(body.as_buffer())
 
 def load_sample_sheet(sample_sheet):
     '''
@@ -43,8 +138,8 @@ def load_sample_sheet(sample_sheet):
     * path to input gtf
     * path to output gtf
     '''
-    print >> sys.stderr, 'Loading sample sheet.'
-    print >> sys.stderr, '  src: %s' % sample_sheet
+    print('Loading sample sheet.', file=sys.stderr)
+    print(f'  src: {sample_sheet}', file=sys.stderr)
 
     samples = pd.read_table(sample_sheet, header=None, index_col=0, names=['gtf_path'])
     samples.index.name = 'sample'
@@ -57,33 +152,36 @@ def find_novel_transcripts(sample, gtf_in, ref_gtf, gtf_out):
     Find all novel, long, well-covered, multi-exonic transcripts
     from de novo transcript assemblies generated by Cufflinks.
     '''
-    print >> sys.stderr, 'Processing:', sample
-    print >> sys.stderr, '  Summary: %s.summary.tsv' % sample
-    print >> sys.stderr, '  GTF Out: %s.novel.gtf' % sample
-
-    # Load relevant GTF columns.
-    x = pd.read_table(gtf_in, header=None, usecols=[2, 3, 4, 8])
-    x.columns = ['feature', 'start', 'end', 'attrs']
-    x = x[x.feature == 'exon']
-
-    # Extract relevant features from attrs column.
-    x['gene_id'] = x.attrs.str.split('gene_id').str[1].str.split('"').str[1]
-    x['transcript_id'] = x.attrs.str.split('transcript_id').str[1].str.split('"').str[1]
+    print('Processing:', sample, file=sys.stderr)
+    print(f'  Summary: {sample}.summary.tsv', file=sys.stderr)
+    print(f'  GTF Out: {sample}.novel.gtf', file=sys.stderr)
+
+    # Load the GTF once; the same table is filtered and written out below.
+    gtf = _read_gtf_cols(gtf_in, range(9))
+
+    # Extract relevant features from the attrs column in one Arrow pass.
+    parsed = _extract_attrs(gtf[8], _ATTR_PATTERNS['transcript_id'], _CUFF_ATTR_PATTERN)
+    gtf['transcript_id'] = parsed.transcript_id
+
+    # Select relevant columns of exon rows.
+    is_exon = gtf[2] == 'exon'
+    x = gtf.loc[is_exon, [3, 4, 'transcript_id']]
+    x.columns = ['start', 'end', 'transcript_id']
+    x['gene_id'] = parsed.gene_id[is_exon]
     x['length'] = x.end - x.start + 1
-    x['exons'] = 1
-    x['coverage'] = x.attrs.str.split('cov').str[1].str.split('"').str[1].astype(float)
+    x['coverage'] = parsed['cov'][is_exon].astype(float)
 
-    x = x[['gene_id', 'transcript_id', 'length', 'exons', 'coverage']]
+    x = x[['gene_id', 'transcript_id', 'length', 'coverage']]
 
-    t_length = x.groupby('transcript_id')[['length']].sum()
-    t_num_exons = x.groupby('transcript_id')[['exons']].sum()
-    t_coverage = x.groupby('transcript_id')[['coverage']].max()
+    t_stats = x.groupby('transcript_id').agg(length=('length', 'sum'),
+                                             exons=('length', 'size'),
+                                             coverage=('coverage', 'max'))
 
     # Compare transcripts with reference gtf.
     t_class_code = _get_cuffcompare_class_codes(ref_gtf, gtf_in)
 
     # Generate table summarizing all filter criteria.
-    y = t_length.join(t_num_exons).join(t_coverage).join(t_class_code)
+    y = t_stats.join(t_class_code)
     y.to_csv(sample + '.summary.tsv', sep='\t')
 
     # Apply filters to table.
@@ -95,65 +193,46 @@ def find_novel_transcripts(sample, gtf_in, ref_gtf, gtf_out):
     ]
 
     # Generate a filtered GTF.
-    _filter_gtf_by_transcript(gtf_in, gtf_out, z.index)
+    _write_gtf(gtf[gtf.transcript_id.isin(z.index)], gtf_out)
 
 def _get_cuffcompare_class_codes(ref_gtf, gtf):
 
-    symlink_created = False
-
-    # If the input GTF is not in the current directory,
-    # create a symlink to it, or cufflinks will put its
-    # output somewhere inconvenient.
-    gtf_local = gtf.split('/')[-1]
-    if not os.path.exists(gtf_local):
-        os.symlink(gtf, gtf_local)
-        symlink_created = True
-
-    # Run cuffcompare against reference gtf.
-    cmd = 'cuffcompare -r %s %s' % (ref_gtf, gtf_local)
-    subprocess.check_call(cmd,
-                          shell=True,
-                          stdout=open('cuffcmp.stdout', 'w'),
-                          stderr=open('cuffcmp.stderr', 'w'))
+    # Run cuffcompare in a private directory so that concurrent
+    # invocations do not overwrite each other's cuffcmp.* files.
+    # The whole directory is removed in one go afterwards.
+    with tempfile.TemporaryDirectory(prefix='cuffcmp_') as tmpdir:
+        # Symlink the input GTF into the working directory, or
+        # cufflinks will put its output somewhere inconvenient.
+        gtf_local = gtf.split('/')[-1]
+        os.symlink(os.path.abspath(gtf), os.path.join(tmpdir, gtf_local))
+
+        # Run cuffcompare against reference gtf. Its log is captured rather
+        # than written into tmpdir, which is removed even on failure.
+        cmd = f'cuffcompare -r {os.path.abspath(ref_gtf)} {gtf_local}'
+        result = subprocess.run(cmd,
+                                shell=True,
+                                cwd=tmpdir,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT,
+                                text=True)
+        if result.returncode != 0:
+            print(result.stdout, file=sys.stderr)
+            raise subprocess.CalledProcessError(result.returncode, cmd, output=result.stdout)
+
+        # Extract information from cuffcompare tmap file.
+        class_codes = pacsv.read_csv(
+            os.path.join(tmpdir, f'cuffcmp.{gtf_local}.tmap'),
+            parse_options=pacsv.ParseOptions(delimiter='\t', quote_char=False),
+            convert_options=pacsv.ConvertOptions(include_columns=_TMAP_COLUMNS,
+                                                 column_types=_TMAP_TYPES),
+        ).to_pandas()
 
-    # Extract information from cuffcompare tmap file.
-    class_codes = pd.read_table('cuffcmp.%s.tmap' % gtf_local)
     class_codes = class_codes.set_index('cuff_id')
     class_codes.index.name = 'transcript_id'
-    class_codes = class_codes[['class_code', 'ref_id', 'ref_gene_id']]
     class_codes = class_codes.sort_index()
 
-    # Remove cuffcompare output files.
-    for junk_file in glob('cuffcmp.*'):
-        os.remove(junk_file)
-
-    # Remove symlink if one was created.
-    if symlink_created:
-        os.remove(gtf_local)
-
     return class_codes
 
-def _filter_gtf_by_transcript(gtf_in, gtf_out, transcripts_to_keep):
-
-    outfid = open(gtf_out, 'w')
-    infid = open(gtf_in, 'r')
-
-    for line in infid:
-
-        # Skip empty lines and comments.
-        if len(line) == 0 or line[0] == '#':
-            continue
-
-        # Extract transcript_id.
-        transcript_id = line.split('transcript_id')[1].split('"')[1]
-
-        # Write selected lines to output GTF.
-        if transcript_id in transcripts_to_keep:
-            outfid.write(line)
-
-    infid.close()
-    outfid.close()
-
 def merge_novel_transcripts(sample_info):
     # Write manifest for cuffmerge.
     sample_info[['gtf_out']].to_csv('novel_transcript_gtfs.txt', header=None, index=None)
@@ -175,64 +254,117 @@ def merge_novel_transcripts(sample_info):
 
 def classify_novel_transcripts(ref_gtf, lnc_gtf):
 
-    print >> sys.stderr, 'Classifying novel transcripts.'
-    print >> sys.stderr, '  ref gtf:', ref_gtf
-    print >> sys.stderr, '  lnc gtf:', lnc_gtf
+    print('Classifying novel transcripts.', file=sys.stderr)
+    print('  ref gtf:', ref_gtf, file=sys.stderr)
+    print('  lnc gtf:', lnc_gtf, file=sys.stderr)
 
     #
     # 1. Compare to ref_gtf and lnc_gtf; extract cufflinks class_codes.
     #
-    novel_vs_ref = _get_cuffcompare_class_codes(ref_gtf, 'novel_transcripts.gtf')
-    novel_vs_lnc = _get_cuffcompare_class_codes(lnc_gtf, 'novel_transcripts.gtf')
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ref_future = executor.submit(_get_cuffcompare_class_codes, ref_gtf, 'novel_transcripts.gtf')
+        lnc_future = executor.submit(_get_cuffcompare_class_codes, lnc_gtf, 'novel_transcripts.gtf')
+        novel_vs_ref = ref_future.result()
+        novel_vs_lnc = lnc_future.result()
     x = novel_vs_ref.join(novel_vs_lnc, lsuffix='__all', rsuffix='__lnc')
 
     #
     # 2. Classify novel transcripts based on cufflinks class_codes.
     #
-    x['classification'] = '.'
-    x.loc[(x.classification == '.') & (x.class_code__lnc == '='), 'classification'] = 'known_isoform'
-    x.loc[(x.classification == '.') & (x.class_code__lnc == 'j')
-                                    & (x.class_code__all == 'j')
-                                    & (x.ref_gene_id__lnc != x.ref_gene_id__all), 'classification'] = 'possible_artifact'
-    x.loc[(x.classification == '.') & (x.class_code__lnc == 'j'), 'classification'] = 'novel_isoform'
-    x.loc[(x.classification == '.') & (x.class_code__all == 'u'), 'classification'] = 'intergenic'
-    x.loc[(x.classification == '.') & (x.class_code__all == 'x')
-                                    & (x.class_code__lnc == 'u'), 'classification'] = 'antisense'
-    x.loc[(x.classification == '.') & (x.class_code__all == 'i'), 'classification'] = 'intronic'
-    x.loc[(x.classification == '.'), 'classification'] = 'not_a_lncRNA'
+    # Conditions are listed in order of precedence; the first match wins.
+    cl = x.class_code__lnc.values
+    ca = x.class_code__all.values
+    gl = x.ref_gene_id__lnc.values
+    ga = x.ref_gene_id__all.values
+    x['classification'] = np.select([
+        cl == '=',
+        (cl == 'j') & (ca == 'j') & (gl != ga),
+        cl == 'j',
+        ca == 'u',
+        (ca == 'x') & (cl == 'u'),
+        ca == 'i',
+    ], [
+        'known_isoform',
+        'possible_artifact',
+        'novel_isoform',
+        'intergenic',
+        'antisense',
+        'intronic',
+    ], default='not_a_lncRNA')
 
     x.to_csv('novel_transcripts.tsv', sep='\t')
 
-def fold_novel_lncs_into_input_gtfs(lnc_gtf, out_gtf):
+    return x
 
-    print >> sys.stderr, 'Writing lncRNA GTF.'
-    print >> sys.stderr, '  final gtf:', out_gtf
+def _cached_parse(path, parse_fn):
+    '''
+    Return parse_fn(path), reusing a Parquet copy of the parsed table
+    stored next to the input while the input's mtime and the parser
+    version are unchanged. The cache is skipped if it cannot be written.
+    '''
+    cache = path + '.parsed.parquet'
+    stamp = cache + '.stamp'
+    key = f'{parse_fn.__name__} v{_PARSE_CACHE_VERSION} {os.path.getmtime(path)}'
+
+    if os.path.exists(cache) and os.path.exists(stamp):
+        with open(stamp) as fid:
+            if fid.read() == key:
+                df = pd.read_parquet(cache)
+                # Parquet only stores string column names.
+                df.columns = [int(c) if c.isdigit() else c for c in df.columns]
+                return df
+
+    df = parse_fn(path)
+    try:
+        df.rename(columns=str).to_parquet(cache)
+        with open(stamp, 'w') as fid:
+            fid.write(key)
+    except OSError as e:
+        print(f'  not caching {path}: {e}', file=sys.stderr)
+
+    return df
+
+def _parse_known_gtf(path):
+    gtf = _read_gtf_cols(path, range(9))
+    gtf = gtf[gtf[2] == 'exon']
+
+    parsed = _attrs(gtf[8], 'gene_id', 'transcript_id', 'gene_name')
+    for key in parsed.columns:
+        gtf[key] = parsed[key].astype('category')
+    return gtf.drop(8, axis=1)
+
+def _parse_novel_gtf(path):
+    gtf = _read_gtf_cols(path, range(9))
+    parsed = _attrs(gtf[8], 'gene_id', 'transcript_id')
+    for key in parsed.columns:
+        gtf[key] = parsed[key].astype('category')
+    return gtf.drop(8, axis=1)
+
+def _sort_codes(series):
+    # Missing values get code -1; move them after every category,
+    # as sort_values would.
+    codes = series.cat.codes.values
+    return np.where(codes < 0, len(series.cat.categories), codes)
+
+def fold_novel_lncs_into_input_gtfs(lnc_gtf, out_gtf, novel_trans_annots):
+
+    print('Writing lncRNA GTF.', file=sys.stderr)
+    print('  final gtf:', out_gtf, file=sys.stderr)
 
     #
     # 1. Process known lncRNAs.
     #
 
     # Load lnc_gtf; extract relevant info from attr column.
-    known_trans_gtf = pd.read_table(lnc_gtf, header=None, comment='#')
-    known_trans_gtf = known_trans_gtf[known_trans_gtf[2] == 'exon']
-
-    known_trans_gtf['gene_id'] = known_trans_gtf[8].str.split('gene_id').str[1].str.split('"').str[1]
-    known_trans_gtf['transcript_id'] = known_trans_gtf[8].str.split('transcript_id').str[1].str.split('"').str[1]
-    known_trans_gtf['gene_name'] = known_trans_gtf[8].str.split('gene_name').str[1].str.split('"').str[1]
-    known_trans_gtf = known_trans_gtf.drop(8, axis=1)
+    known_trans_gtf = _cached_parse(lnc_gtf, _parse_known_gtf)
 
     #
     # 2. Load novel lncRNA info.
     #
 
     # Load novel transcripts gtf; extract relevant info from attr column.
-    novel_trans_gtf = pd.read_table('novel_transcripts.gtf', header=None)
-    novel_trans_gtf['gene_id'] = novel_trans_gtf[8].str.split('gene_id').str[1].str.split('"').str[1]
-    novel_trans_gtf['transcript_id'] = novel_trans_gtf[8].str.split('transcript_id').str[1].str.split('"').str[1]
-    novel_trans_gtf = novel_trans_gtf.drop(8, axis=1)
-
-    # Load novel transcript classifications.
-    novel_trans_annots = pd.read_table('novel_transcripts.tsv', index_col=0)
+    # cuffmerge rewrites this file on every run, so it is not cached.
+    novel_trans_gtf = _parse_novel_gtf('novel_transcripts.gtf')
 
     #
     # 3. Process novel isoforms of known lncRNAs.
@@ -243,10 +375,10 @@ def fold_novel_lncs_into_input_gtfs(lnc_gtf, out_gtf):
     novel_isoform_gtf = novel_trans_gtf[novel_trans_gtf.transcript_id.isin(novel_isoform_annots.index)]
 
     # Replace XLOCs with official gene names from reference GTF.
-    trans_id_to_gene_name = novel_trans_annots.ref_gene_id__lnc
-    gene_name_to_gene_id = known_trans_gtf[['gene_name', 'gene_id']].groupby('gene_name').first().gene_id
+    trans_id_to_gene_name = novel_trans_annots.ref_gene_id__lnc.to_dict()
+    gene_name_to_gene_id = known_trans_gtf[['gene_name', 'gene_id']].groupby('gene_name', observed=True).first().gene_id.to_dict()
     novel_isoform_gtf['gene_name'] = novel_isoform_gtf.transcript_id.map(trans_id_to_gene_name)
-    novel_isoform_gtf.loc[:, 'gene_id'] = novel_isoform_gtf.gene_name.map(gene_name_to_gene_id)
+    novel_isoform_gtf['gene_id'] = novel_isoform_gtf.gene_name.map(gene_name_to_gene_id)
 
     #
     # 4. Process completely novel lncRNAs.
@@ -271,17 +403,30 @@ def fold_novel_lncs_into_input_gtfs(lnc_gtf, out_gtf):
     #
     # 6. Sort, grouping isoforms by gene.
     #
-    start_pos = df.groupby('gene_id')[[3]].min().rename(columns={3: 'start_pos'})
-    df = pd.merge(df, start_pos, how='left', left_on='gene_id', right_index=True)
-    df = df.sort([0, 'start_pos', 'gene_id', 'transcript_id'])
-    df = df.reset_index(drop=True)
+    # Categories are created in sorted order, so sorting on their integer
+    # codes matches sorting on the strings themselves.
+    for col in [0, 'gene_id', 'transcript_id']:
+        df[col] = df[col].astype('category')
+    df['start_pos'] = df.groupby('gene_id', observed=True)[3].transform('min')
+    order = np.lexsort((_sort_codes(df.transcript_id),
+                        _sort_codes(df.gene_id),
+                        df.start_pos.values,
+                        _sort_codes(df[0])))
+    df = df.iloc[order].reset_index(drop=True)
 
     #
     # 7. Convert table to gtf; write to disk.
     #
-    df[8] = 'gene_id "' + df.gene_id + '"; transcript_id "' + df.transcript_id + '"; gene_name "' + df.gene_name + '";'
-    df = df.loc[:, range(9)]
-    df.to_csv(out_gtf, sep='\t', header=None, index=None, quoting=csv.QUOTE_NONE)
+    # Attributes only vary by transcript, so format each distinct
+    # (gene_id, transcript_id, gene_name) once and broadcast to its exons.
+    # Tuples with a missing id get a null attribute rather than "nan";
+    # the trailing None also covers rows factorize codes as -1.
+    codes, uniq = pd.MultiIndex.from_arrays([df.gene_id, df.transcript_id, df.gene_name]).factorize()
+    attrs = np.array([None if pd.isna([g, t, n]).any()
+                      else f'gene_id "{g}"; transcript_id "{t}"; gene_name "{n}";'
+                      for g, t, n in uniq] + [None], dtype=object)
+    df[8] = attrs[codes]
+    _write_gtf(df, out_gtf)
 
 
 #  __  __      _
@@ -289,11 +434,22 @@ def fold_novel_lncs_into_input_gtfs(lnc_gtf, out_gtf):
 # | |\/| / _` | | ' \
 # |_|  |_\__,_|_|_||_|
 #
-sample_info = load_sample_sheet(sample_sheet)
-
-for sample, gtf_in, gtf_out in sample_info.itertuples():
-    find_novel_transcripts(sample, gtf_in, ref_gtf, gtf_out)
-
-merge_novel_transcripts(sample_info)
-classify_novel_transcripts(ref_gtf, lnc_gtf)
-fold_novel_lncs_into_input_gtfs(lnc_gtf, 'lncRNA_catalog.gtf')
+if __name__ == '__main__':
+    try:
+        sample_sheet = sys.argv[1]
+        ref_gtf = sys.argv[2]
+        lnc_gtf = sys.argv[3]
+    except IndexError:
+        print(USAGE % sys.argv[0].split('/')[-1])
+        sys.exit(1)
+
+    sample_info = load_sample_sheet(sample_sheet)
+
+    Parallel(n_jobs=-1, backend='loky')(
+        delayed(find_novel_transcripts)(sample, gtf_in, ref_gtf, gtf_out)
+        for sample, gtf_in, gtf_out in sample_info.itertuples()
+    )
+
+    merge_novel_transcripts(sample_info)
+    novel_trans_annots = classify_novel_transcripts(ref_gtf, lnc_gtf)
+    fold_novel_lncs_into_input_gtfs(lnc_gtf, 'lncRNA_catalog.gtf', novel_trans_annots)